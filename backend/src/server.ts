@@ -22,12 +22,16 @@ const app = express();
 const PORT = process.env.PORT || 3000;
 
 // Rate limiting configuration
+// DISABLE_RATE_LIMIT=true lets load/soak tests reach the route handlers (never set in production)
+const skipRateLimit = (): boolean => process.env.DISABLE_RATE_LIMIT === 'true';
+
 const generalLimiter = rateLimit({
   windowMs: 15 * 60 * 1000, // 15 minutes
   max: 100, // Limit each IP to 100 requests per windowMs
   message: { success: false, error: 'Too many requests, please try again later' },
   standardHeaders: true,
   legacyHeaders: false,
+  skip: skipRateLimit,
 });
 
 const authLimiter = rateLimit({
@@ -36,6 +40,7 @@ const authLimiter = rateLimit({
   message: { success: false, error: 'Too many authentication attempts, please try again later' },
   standardHeaders: true,
   legacyHeaders: false,
+  skip: skipRateLimit,
 });
 
 const interactLimiter = rateLimit({
@@ -44,6 +49,7 @@ const interactLimiter = rateLimit({
   message: { success: false, error: 'Too many interactions, please slow down' },
   standardHeaders: true,
   legacyHeaders: false,
+  skip: skipRateLimit,
 });
 
 // Middleware
@@ -6,14 +6,49 @@ Cross-platform Python script to start the entire application
 
 import os
 import sys
+import argparse
+import csv
+import json
+import statistics
 import subprocess
+import threading
 import time
 import platform
 import signal
 import shutil
+from datetime import datetime
+from http.client import HTTPException
 from pathlib import Path
-from urllib.request import urlopen
-from urllib.error import URLError
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+
+BACKEND_URL = 'http://localhost:3000'
+POSTGRES_CONTAINER = 'vibecheck-postgres'
+POSTGRES_USER = 'vibecheck'
+POSTGRES_DB = 'vibecheck'
+
+# Soak-test defaults
+SOAK_HOURS = 4.0
+SOAK_INTERVAL = 60
+# Samples taken while ts-node, V8 and the pg pool warm up are kept in the
+# timeseries but left out of the trend fit.
+SOAK_WARMUP_MINUTES = 10
+SOAK_WORKERS = 4
+SOAK_ENDPOINTS = ['/api/health', '/api/profile', '/api/feed', '/api/notifications', '/api/requests']
+SOAK_MIN_SAMPLES = 10
+# Flat metrics only mean something if the load actually reached the route
+# handlers, so a soak where fewer requests than this succeed fails.
+SOAK_MIN_OK_RATIO = 0.5
+LOAD_KEYS = ['requests_ok', 'requests_failed', 'requests_rate_limited', 'requests_unreachable']
+# Monotonicity is judged on the medians of this many consecutive windows, so
+# GC jitter in RSS does not hide a steady climb.
+SOAK_TREND_WINDOWS = 8
+# A metric is flagged as leaking when its least-squares fit explains most of
+# the variance, its window medians almost never step down, and it grew by a
+# meaningful amount.
+LEAK_MIN_R2 = 0.8
+LEAK_MIN_RISING_RATIO = 0.8
+LEAK_MIN_GROWTH = 0.05
 
 # ANSI color codes for colored output
 class Colors:
@@ -91,8 +126,8 @@ def initialize_database(script_dir):
             sql_content = f.read()
         
         process = subprocess.Popen(
-            ['docker', 'exec', '-i', 'vibecheck-postgres', 
-             'psql', '-U', 'vibecheck', '-d', 'vibecheck'],
+            ['docker', 'exec', '-i', POSTGRES_CONTAINER,
+             'psql', '-U', POSTGRES_USER, '-d', POSTGRES_DB],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
@@ -113,7 +148,7 @@ def initialize_database(script_dir):
 
 def check_backend_health(max_retries=5):
     """Check if backend is responding"""
-    backend_url = 'http://localhost:3000/api/health'
+    backend_url = f'{BACKEND_URL}/api/health'
     
     for i in range(1, max_retries + 1):
         try:
@@ -126,8 +161,8 @@ def check_backend_health(max_retries=5):
     
     return False
 
-def start_backend(script_dir):
-    """Start the backend server"""
+def start_backend(script_dir, log_file=None, env=None):
+    """Start the backend server (output goes to log_file when given)"""
     print_step(4, 5, "Starting Backend Server...")
     
     backend_dir = script_dir / 'backend'
@@ -145,15 +180,18 @@ def start_backend(script_dir):
             process = subprocess.Popen(
                 ['powershell', '-NoExit', '-Command', 
                  f"cd '{backend_dir}'; Write-Host 'Starting Backend...' -ForegroundColor Cyan; npm run dev"],
+                env=env,
                 creationflags=subprocess.CREATE_NEW_CONSOLE
             )
         else:
-            # Linux/Mac: start in background
+            # Linux/Mac: start in background. A long run must not write into
+            # an undrained pipe, so soak mode hands us a log file instead.
             process = subprocess.Popen(
                 ['npm', 'run', 'dev'],
                 cwd=backend_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                env=env,
+                stdout=log_file or subprocess.PIPE,
+                stderr=subprocess.STDOUT if log_file else subprocess.PIPE
             )
         
         time.sleep(8)
@@ -232,8 +270,417 @@ def cleanup(processes):
     
     print_colored("Application stopped.", Colors.GREEN)
 
+def run_psql(query):
+    """Run a query in the Postgres container and return rows as lists of strings"""
+    try:
+        result = subprocess.run(
+            ['docker', 'exec', POSTGRES_CONTAINER,
+             'psql', '-U', POSTGRES_USER, '-d', POSTGRES_DB,
+             '-At', '-F', '\t', '-c', query],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+            timeout=30
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    
+    if result.returncode != 0:
+        return None
+    
+    return [line.split('\t') for line in result.stdout.decode().splitlines() if line]
+
+def sample_database():
+    """Sample connection count and table/index sizes from Postgres"""
+    sample = {}
+    
+    rows = run_psql(
+        "SELECT coalesce(state, ''), count(*) FROM pg_stat_activity "
+        "WHERE datname = current_database() AND pid <> pg_backend_pid() "
+        "GROUP BY state"
+    )
+    if rows is not None:
+        counts = {state: int(count) for state, count in rows}
+        sample['pg_connections'] = sum(counts.values())
+        sample['pg_idle_in_transaction'] = counts.get('idle in transaction', 0)
+    
+    rows = run_psql("SELECT pg_database_size(current_database())")
+    if rows:
+        sample['pg_database_bytes'] = int(rows[0][0])
+    
+    rows = run_psql(
+        "SELECT c.relname, pg_table_size(c.oid), pg_indexes_size(c.oid) "
+        "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relkind = 'r' AND n.nspname = 'public'"
+    )
+    for name, table_bytes, index_bytes in rows or []:
+        sample[f'table_bytes:{name}'] = int(table_bytes)
+        sample[f'index_bytes:{name}'] = int(index_bytes)
+    
+    return sample
+
+def get_process_tree(root_pid):
+    """Return {pid: rss_kb} for a process and all of its descendants"""
+    try:
+        result = subprocess.run(['ps', '-A', '-o', 'pid=,ppid=,rss='],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                check=False)
+    except FileNotFoundError:
+        return {}
+    
+    children = {}
+    rss = {}
+    for line in result.stdout.decode().splitlines():
+        fields = line.split()
+        if len(fields) != 3:
+            continue
+        pid, ppid, rss_kb = (int(field) for field in fields)
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = rss_kb
+    
+    tree = {}
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        if pid in rss and pid not in tree:
+            tree[pid] = rss[pid]
+            pending.extend(children.get(pid, []))
+    return tree
+
+def count_open_fds(pid):
+    """Count open file descriptors of a process (None if unavailable)"""
+    fd_dir = Path(f'/proc/{pid}/fd')
+    if fd_dir.exists():
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            return None
+    
+    if check_command_exists('lsof'):
+        result = subprocess.run(['lsof', '-p', str(pid)],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                check=False)
+        # First line is the column header
+        return max(len(result.stdout.decode().splitlines()) - 1, 0)
+    
+    return None
+
+def sample_backend(process):
+    """Sample RSS and open file descriptors of the backend process tree"""
+    tree = get_process_tree(process.pid)
+    if not tree:
+        return {}
+    
+    sample = {
+        'backend_processes': len(tree),
+        'backend_rss_mb': round(sum(tree.values()) / 1024, 2),
+    }
+    
+    fd_counts = [count_open_fds(pid) for pid in tree]
+    if all(count is not None for count in fd_counts):
+        sample['backend_open_fds'] = sum(fd_counts)
+    
+    return sample
+
+def soak_login():
+    """Log in a dedicated soak-test user and return its JWT (None on failure)"""
+    body = json.dumps({'email': 'soak-test@vibecheck.local'}).encode('utf-8')
+    request = Request(f'{BACKEND_URL}/api/auth/login', data=body,
+                      headers={'Content-Type': 'application/json'})
+    try:
+        response = urlopen(request, timeout=10)
+        return json.loads(response.read())['data']['token']
+    except (OSError, HTTPException, ValueError, KeyError, TypeError):
+        return None
+
+def soak_worker(token, stats, lock, stop_event):
+    """Send requests round-robin over SOAK_ENDPOINTS until stopped"""
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    index = 0
+    
+    while not stop_event.is_set():
+        endpoint = SOAK_ENDPOINTS[index % len(SOAK_ENDPOINTS)]
+        index += 1
+        
+        try:
+            response = urlopen(Request(f'{BACKEND_URL}{endpoint}', headers=headers), timeout=10)
+            response.read()
+            key = 'requests_ok'
+        except HTTPError as e:
+            if e.code == 429:
+                key = 'requests_rate_limited'
+                stop_event.wait(1)
+            else:
+                key = 'requests_failed'
+        except HTTPException:
+            # Truncated or malformed responses (IncompleteRead, BadStatusLine)
+            key = 'requests_failed'
+        except (URLError, OSError):
+            key = 'requests_unreachable'
+            stop_event.wait(1)
+        
+        with lock:
+            stats[key] = stats.get(key, 0) + 1
+
+def fit_trend(xs, ys):
+    """Least-squares line through (xs, ys); returns (slope, intercept, r2)"""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    
+    if sxx == 0 or syy == 0:
+        return 0.0, mean_y, 0.0
+    
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    r2 = sxy * sxy / (sxx * syy)
+    return slope, intercept, r2
+
+def window_medians(values, windows=SOAK_TREND_WINDOWS):
+    """Medians of up to `windows` consecutive, equally sized chunks of values"""
+    windows = min(windows, len(values))
+    bounds = [round(i * len(values) / windows) for i in range(windows + 1)]
+    return [statistics.median(values[start:end]) for start, end in zip(bounds, bounds[1:])]
+
+def analyze_metric(samples, metric, warmup_hours=0):
+    """Fit a trend line to one metric (after warm-up) and decide whether it looks like a leak
+
+    A steady climb is flagged even with GC-style noise, a warm-up followed by
+    a plateau is not:
+
+    >>> import random
+    >>> rng = random.Random(0)
+    >>> ramp = [{'elapsed_hours': i / 60, 'rss': 200 + 200 * i / 240 + rng.uniform(-5, 5)}
+    ...         for i in range(241)]
+    >>> analyze_metric(ramp, 'rss')['leak']
+    True
+    >>> plateau = [{'elapsed_hours': i / 60, 'rss': 100 + min(i, 10) * 10 + rng.uniform(-5, 5)}
+    ...            for i in range(241)]
+    >>> analyze_metric(plateau, 'rss', warmup_hours=10 / 60)['leak']
+    False
+    """
+    points = [(s['elapsed_hours'], s[metric]) for s in samples
+              if s.get(metric) is not None and s['elapsed_hours'] >= warmup_hours]
+    if len(points) < SOAK_MIN_SAMPLES:
+        return {'metric': metric, 'samples': len(points), 'leak': False,
+                'note': 'insufficient samples'}
+    
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    slope, intercept, r2 = fit_trend(xs, ys)
+    
+    medians = window_medians(ys)
+    steps = [b - a for a, b in zip(medians, medians[1:]) if b != a]
+    rising_ratio = sum(1 for step in steps if step > 0) / len(steps) if steps else 0.0
+    growth = slope * (xs[-1] - xs[0])
+    relative_growth = growth / max(abs(intercept + slope * xs[0]), 1)
+    
+    return {
+        'metric': metric,
+        'samples': len(points),
+        'first': ys[0],
+        'last': ys[-1],
+        'slope_per_hour': round(slope, 4),
+        'r2': round(r2, 4),
+        'rising_ratio': round(rising_ratio, 4),
+        'relative_growth': round(relative_growth, 4),
+        'leak': (slope > 0
+                 and r2 >= LEAK_MIN_R2
+                 and rising_ratio >= LEAK_MIN_RISING_RATIO
+                 and relative_growth >= LEAK_MIN_GROWTH),
+    }
+
+def write_soak_report(report_dir, samples, summary):
+    """Write the timeseries CSV and the trend summary"""
+    columns = []
+    for sample in samples:
+        for key in sample:
+            if key not in columns:
+                columns.append(key)
+    
+    with open(report_dir / 'samples.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(samples)
+    
+    with open(report_dir / 'summary.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+def run_soak(backend_process, report_dir, hours, interval, workers, warmup_minutes):
+    """Drive sustained load while sampling resources; returns the reasons the soak failed"""
+    print_step(5, 5, f"Running Soak Test ({hours:g}h, sampling every {interval}s)...")
+    
+    sample_process = platform.system() != 'Windows'
+    if not sample_process:
+        print_warning("Backend runs in a separate console on Windows; RSS/FD sampling disabled")
+    
+    token = soak_login()
+    if not token:
+        print_warning("Soak login failed, authenticated endpoints will return errors")
+    
+    stats = {}
+    lock = threading.Lock()
+    stop_event = threading.Event()
+    threads = [threading.Thread(target=soak_worker, args=(token, stats, lock, stop_event), daemon=True)
+               for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    
+    samples = []
+    started = time.time()
+    deadline = started + hours * 3600
+    backend_exit = None
+    
+    try:
+        with open(report_dir / 'samples.jsonl', 'w', encoding='utf-8') as timeseries:
+            while True:
+                now = time.time()
+                with lock:
+                    load = dict(stats)
+                    stats.clear()
+                
+                sample = {
+                    'timestamp': datetime.now().isoformat(timespec='seconds'),
+                    'elapsed_hours': round((now - started) / 3600, 4),
+                    **load,
+                }
+                if sample_process:
+                    sample.update(sample_backend(backend_process))
+                sample.update(sample_database())
+                samples.append(sample)
+                
+                timeseries.write(json.dumps(sample) + '\n')
+                timeseries.flush()
+                print_colored(
+                    f"  [{sample['elapsed_hours']:.2f}h] rss={sample.get('backend_rss_mb', '-')}MB "
+                    f"fds={sample.get('backend_open_fds', '-')} "
+                    f"pg_conns={sample.get('pg_connections', '-')} "
+                    f"ok={load.get('requests_ok', 0)} 429={load.get('requests_rate_limited', 0)}",
+                    Colors.GRAY
+                )
+                
+                backend_exit = backend_process.poll()
+                if backend_exit is not None:
+                    print_error(f"Backend exited with code {backend_exit} during soak test")
+                    break
+                if now >= deadline:
+                    break
+                time.sleep(min(interval, max(deadline - time.time(), 0)))
+    except KeyboardInterrupt:
+        print_warning("Soak test interrupted, writing partial report")
+    finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=15)
+    
+    metrics = []
+    for sample in samples:
+        for key in sample:
+            if key not in ('timestamp', 'elapsed_hours', *LOAD_KEYS) and key not in metrics:
+                metrics.append(key)
+    
+    requests = {key: sum(s.get(key, 0) for s in samples) for key in LOAD_KEYS}
+    requests_fitted = {key: sum(s.get(key, 0) for s in samples
+                                if s['elapsed_hours'] >= warmup_minutes / 60)
+                       for key in LOAD_KEYS}
+    fitted_total = sum(requests_fitted.values())
+    trends = [analyze_metric(samples, metric, warmup_minutes / 60) for metric in metrics]
+    leaks = [trend['metric'] for trend in trends if trend['leak']]
+    
+    failures = []
+    if backend_exit is not None:
+        failures.append(f"Backend exited with code {backend_exit} during soak test")
+    if leaks:
+        failures.append(f"Monotonic growth detected in: {', '.join(leaks)}")
+    if requests_fitted['requests_ok'] < SOAK_MIN_OK_RATIO * max(fitted_total, 1):
+        failures.append(f"Load did not reach the backend: {requests_fitted['requests_ok']} of "
+                        f"{fitted_total} requests succeeded after warm-up")
+    if not any('slope_per_hour' in trend for trend in trends):
+        failures.append(f"Soak test inconclusive: no metric reached {SOAK_MIN_SAMPLES} samples after warm-up")
+    
+    write_soak_report(report_dir, samples, {
+        'started': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+        'duration_hours': round((time.time() - started) / 3600, 4),
+        'interval_seconds': interval,
+        'workers': workers,
+        'warmup_minutes': warmup_minutes,
+        'backend_exit_code': backend_exit,
+        'requests': requests,
+        'requests_after_warmup': requests_fitted,
+        'thresholds': {
+            'min_samples': SOAK_MIN_SAMPLES,
+            'min_ok_ratio': SOAK_MIN_OK_RATIO,
+            'min_r2': LEAK_MIN_R2,
+            'min_rising_ratio': LEAK_MIN_RISING_RATIO,
+            'min_relative_growth': LEAK_MIN_GROWTH,
+        },
+        'passed': not failures,
+        'failures': failures,
+        'leaks': leaks,
+        'trends': trends,
+    })
+    
+    print_colored(f"\n=== Soak Test Report: {report_dir} ===", Colors.CYAN + Colors.BOLD)
+    for trend in trends:
+        if 'slope_per_hour' not in trend:
+            print_colored(f"  {trend['metric']}: {trend['note']}", Colors.GRAY)
+            continue
+        line = (f"  {trend['metric']}: {trend['first']} -> {trend['last']} "
+                f"({trend['slope_per_hour']:+}/h, r2={trend['r2']})")
+        print_colored(line, Colors.RED if trend['leak'] else Colors.WHITE)
+    
+    for failure in failures:
+        print_error(failure)
+    if not failures:
+        print_success("No monotonic resource growth detected")
+    
+    return failures
+
+def positive_number(kind, allow_zero=False):
+    """argparse type that only accepts numbers greater than zero (or zero, if allowed)"""
+    def parse(value):
+        try:
+            number = kind(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid number: {value}")
+        if number < 0 and allow_zero:
+            raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+        if number <= 0 and not allow_zero:
+            raise argparse.ArgumentTypeError(f"must be greater than zero: {value}")
+        return number
+    return parse
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Start the VibeCheck application')
+    parser.add_argument('--soak', action='store_true',
+                        help='run a sustained load against the backend and report resource leaks')
+    parser.add_argument('--soak-hours', type=positive_number(float), default=SOAK_HOURS,
+                        help=f'soak test duration in hours (default: {SOAK_HOURS:g})')
+    parser.add_argument('--soak-interval', type=positive_number(int), default=SOAK_INTERVAL,
+                        help=f'seconds between resource samples (default: {SOAK_INTERVAL})')
+    parser.add_argument('--soak-workers', type=positive_number(int), default=SOAK_WORKERS,
+                        help=f'concurrent load generator threads (default: {SOAK_WORKERS})')
+    parser.add_argument('--soak-warmup', type=positive_number(float, allow_zero=True),
+                        default=SOAK_WARMUP_MINUTES,
+                        help=f'minutes excluded from the trend fit (default: {SOAK_WARMUP_MINUTES})')
+    args = parser.parse_args()
+    
+    fitted_samples = (args.soak_hours * 60 - args.soak_warmup) * 60 / args.soak_interval
+    if fitted_samples < SOAK_MIN_SAMPLES:
+        parser.error(f"--soak-hours minus --soak-warmup must leave room for at least "
+                     f"{SOAK_MIN_SAMPLES} samples at --soak-interval")
+    
+    return args
+
 def main():
     """Main application startup function"""
+    args = parse_args()
     print_colored("=== Starting VibeCheck App ===", Colors.CYAN + Colors.BOLD)
     
     # Get the script directory
@@ -257,6 +704,27 @@ def main():
     if not initialize_database(script_dir):
         print_warning("Continuing without database initialization...")
     
+    # Soak mode: supervise the backend under load instead of starting the frontend
+    if args.soak:
+        report_dir = script_dir / 'soak-reports' / datetime.now().strftime('%Y%m%d-%H%M%S')
+        report_dir.mkdir(parents=True, exist_ok=True)
+        
+        with open(report_dir / 'backend.log', 'w', encoding='utf-8') as backend_log:
+            # Rate limiting would reject almost all soak traffic before it
+            # reaches a route handler, so turn it off for the supervised backend
+            backend_env = dict(os.environ, DISABLE_RATE_LIMIT='true')
+            backend_process = start_backend(script_dir, log_file=backend_log, env=backend_env)
+            if not backend_process:
+                sys.exit(1)
+            
+            try:
+                failures = run_soak(backend_process, report_dir, args.soak_hours,
+                                 args.soak_interval, args.soak_workers, args.soak_warmup)
+            finally:
+                cleanup([backend_process])
+        
+        sys.exit(1 if failures else 0)
+    
     # Step 4: Start backend
     backend_process = start_backend(script_dir)
     if backend_process: